@@ -0,0 +1,51 @@
+import unittest
+
+import numpy as np
+
+from wallstreet.blackandscholes import BlackandScholes, chain_greeks
+
+
+class ChainGreeksTest(unittest.TestCase):
+    S, T, r, q = 100, 0.5, 0.02, 0.01
+    strikes = [90, 100, 110]
+
+    def check(self, option, prices):
+        greeks = chain_greeks(self.S, self.strikes, self.T, prices, self.r, option, self.q)
+        for i, (K, price) in enumerate(zip(self.strikes, prices)):
+            bs = BlackandScholes(self.S, K, self.T, price, self.r, option, self.q)
+            self.assertAlmostEqual(greeks['impvol'][i], bs.impvol, places=5)
+            for name in ('delta', 'gamma', 'vega', 'theta', 'rho'):
+                self.assertAlmostEqual(greeks[name][i], getattr(bs, name)(), places=4, msg=name)
+
+    def test_call(self):
+        self.check('Call', [13.5, 6.2, 2.4])
+
+    def test_put(self):
+        self.check('Put', [2.8, 6.0, 12.0])
+
+    def test_wings(self):
+        for T, sigma, strikes in ((0.05, 0.6, np.arange(60, 150, 10.)), (0.25, 0.8, np.linspace(30, 250, 16))):
+            for option in ('Call', 'Put'):
+                bs = BlackandScholes._BlackScholesCall if option == 'Call' else BlackandScholes._BlackScholesPut
+                prices = bs(self.S, strikes, T, sigma, self.r, self.q)
+                greeks = chain_greeks(self.S, strikes, T, prices, self.r, option, self.q)
+                np.testing.assert_allclose(greeks['impvol'], sigma, atol=1e-5, err_msg='%s T=%s' % (option, T))
+                self.assertFalse(np.isnan(greeks['delta']).any())
+
+    def test_no_solution(self):
+        greeks = chain_greeks(self.S, [90, 100], self.T, [5, 200], self.r, 'Call', self.q)  # Below intrinsic, above spot
+        self.assertTrue(np.isnan(greeks['impvol']).all())
+
+    def test_none_converge(self):
+        greeks = chain_greeks(self.S, np.arange(80, 130, 10.), 0.25, np.zeros(5), 0.03, 'Call')
+        self.assertTrue(np.isnan(greeks['impvol']).all())
+        self.assertEqual(greeks['delta'].shape, (5,))
+
+    def test_some_converge(self):
+        greeks = chain_greeks(self.S, self.strikes, self.T, [13.5, 0, 2.4], self.r, 'Call', self.q)
+        self.assertEqual(list(np.isnan(greeks['impvol'])), [False, True, False])
+
+    def test_empty(self):
+        greeks = chain_greeks(self.S, [], self.T, [], self.r, 'Put')
+        self.assertEqual(set(greeks), {'impvol', 'delta', 'gamma', 'vega', 'theta', 'rho'})
+        self.assertTrue(all(val.shape == (0,) for val in greeks.values()))
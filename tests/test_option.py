@@ -1,5 +1,13 @@
 import unittest
+import threading
+from time import sleep
+from calendar import timegm
+from datetime import date, datetime, timedelta
+from unittest.mock import Mock
+from concurrent.futures import ThreadPoolExecutor
+
 from wallstreet import wallstreet, blackandscholes
+from wallstreet.scheduler import RequestScheduler
 from tests.mockrequests import mockrequests
 
 
@@ -63,3 +71,251 @@ class CallTest(unittest.TestCase):
     def tearDown(self):
         wallstreet.requests = self.oldrequests
         blackandscholes.requests = self.oldrequests
+
+
+class StubYahoo:
+    """ Serves generated option chains, `one_sided` maps an expiration to the side it lacks """
+
+    def __init__(self, expirations, one_sided=None):
+        self.expirations = expirations
+        self.one_sided = one_sided or {}
+        self.requests = []
+        self.version = 0
+        self.latency = 0
+        self.strikes = (90, 100, 110)
+        self.drop = ()  # Fields left out of the contract with the highest strike
+
+    def contracts(self):
+        contracts = [{'strike': k, 'lastPrice': 5 + self.version, 'bid': 4 + self.version, 'ask': 6 + self.version,
+                 'volume': 10, 'openInterest': 100, 'contractSymbol': 'STUB%s' % k} for k in self.strikes]
+        for key in self.drop:
+            del contracts[-1][key]
+        return contracts
+
+    def __call__(self, url, **kwargs):
+        self.requests.append(url)
+        sleep(self.latency)
+        exp = self.expirations[0]
+        if 'date=' in url:
+            requested = datetime.utcfromtimestamp(int(url.split('date=')[1])).date()
+            exp = min(self.expirations, key=lambda x: abs(x - requested))
+        chain = {'expirationDate': timegm(exp.timetuple()), 'calls': self.contracts(), 'puts': self.contracts()}
+        if exp in self.one_sided:
+            chain[self.one_sided[exp]] = []
+        quote = {'symbol': 'STUB', 'regularMarketPrice': 100, 'currency': 'USD', 'exchange': 'NMS',
+                 'regularMarketChange': 0, 'regularMarketChangePercent': 0, 'regularMarketTime': 1490182692}
+        result = {'quote': quote, 'expirationDates': [timegm(e.timetuple()) for e in self.expirations],
+                  'options': [chain]}
+        return Mock(status_code=200, **{'json.return_value': {'optionChain': {'result': [result]}}})
+
+    def chain_requests(self):
+        return [url for url in self.requests if 'date=' in url]
+
+
+class StubTestCase(unittest.TestCase):
+    def setUp(self):
+        today = date.today()
+        self.exps = [today + timedelta(days=30), today + timedelta(days=60), today + timedelta(days=90)]
+        self.stub = StubYahoo(self.exps, one_sided={self.exps[1]: 'calls'})
+        self.oldscheduler = wallstreet._scheduler
+        wallstreet._scheduler = RequestScheduler(fetch=self.stub, rate=1000, burst=1000)
+        wallstreet._chains.clear()
+        wallstreet._expirations.clear()
+        self.oldrequests = blackandscholes.requests
+        blackandscholes.requests = mockrequests
+
+    def tearDown(self):
+        wallstreet._scheduler = self.oldscheduler
+        wallstreet._chains.clear()
+        wallstreet._expirations.clear()
+        blackandscholes.requests = self.oldrequests
+
+
+class ConcurrencyTest(StubTestCase):
+    def test_consistent_reads(self):
+        c = wallstreet.Call('STUB', d=self.exps[0].day, m=self.exps[0].month, y=self.exps[0].year, strike=100)
+
+        def read(i):
+            self.stub.version = i
+            state = c._state
+            contract = next(dic for dic in state.data if dic['strike'] == state.quote.strike)
+            return c.bid, state.quote.bid == contract['bid'] and state.quote.strike in state.strikes
+
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(read, range(16)))
+        self.assertTrue(all(consistent for _, consistent in results))
+
+    def test_set_strike_during_update(self):
+        exp = self.exps[0]
+        c = wallstreet.Call('STUB', d=exp.day, m=exp.month, y=exp.year, strike=100)
+        snapshot, building, release = c._snapshot, threading.Event(), threading.Event()
+
+        def held(*args):
+            if not building.is_set():  # Hold the update while it prices the old strike
+                building.set()
+                release.wait(5)
+            return snapshot(*args)
+
+        c._snapshot = held
+        updating = threading.Thread(target=c.update)
+        updating.start()
+        building.wait(5)
+        c.set_strike(110)
+        release.set()
+        updating.join()
+        self.assertEqual(c.strike, 110)
+
+    def test_concurrent_updates_share_refresh(self):
+        exp = self.exps[0]
+        c = wallstreet.Call('STUB', d=exp.day, m=exp.month, y=exp.year, strike=100)
+        snapshot, builds = c._snapshot, []
+        c._snapshot = lambda *args: builds.append(1) or snapshot(*args)
+        self.stub.latency = 0.02
+        self.stub.requests.clear()
+        with ThreadPoolExecutor(32) as pool:
+            list(pool.map(lambda _: c.bid, range(32)))
+        self.assertEqual(len(builds), len(self.stub.chain_requests()))  # No rebuilds after a lost swap
+        self.assertLess(len(self.stub.chain_requests()), 32)
+
+    def test_strike_delisted(self):
+        exp = self.exps[0]
+        c = wallstreet.Call('STUB', d=exp.day, m=exp.month, y=exp.year, strike=110)
+        self.stub.strikes = (90, 100, 105)
+        self.assertEqual(c.bid, 4)
+        self.assertEqual(c.strike, 105)
+
+    def test_set_time(self):
+        c = wallstreet.Call('STUB', d=self.exps[0].day, m=self.exps[0].month, y=self.exps[0].year)
+        c.T = 0.5
+        c.set_strike(100)
+        self.assertEqual(c.BandS.T, 0.5)
+
+
+class ExportTest(unittest.TestCase):
+    columns = ['code', 'expiration', 'strike', 'price', 'bid', 'ask', 'change', 'cp', 'volume',
+               'open_interest', 'itm', 'impvol', 'delta', 'gamma', 'vega', 'theta', 'rho']
+
+    def setUp(self):
+        self.oldscheduler = wallstreet._scheduler
+        wallstreet._scheduler = RequestScheduler(fetch=mockrequests.get)
+        self.oldrequests = blackandscholes.requests
+        blackandscholes.requests = mockrequests
+
+    def test_to_numpy(self):
+        s = wallstreet.Call('GOOG', d=16, m=6, y=2017)
+        a = s.to_numpy()
+        self.assertEqual(list(a.dtype.names), self.columns)
+        self.assertEqual(len(a), len(s.strikes))
+        self.assertEqual(tuple(a.strike), s.strikes)
+        self.assertEqual(a.dtype['volume'], 'int64')
+        self.assertEqual(a.dtype['expiration'], 'datetime64[D]')
+
+    def test_to_arrow(self):
+        import pyarrow as pa
+
+        s = wallstreet.Put('GOOG', d=16, m=6, y=2017)
+        t = s.to_arrow()
+        self.assertEqual(t.column_names, self.columns)
+        self.assertEqual(t.num_rows, len(s.strikes))
+        self.assertEqual(t.schema.field('code').type, pa.string())
+        self.assertEqual(t.schema.field('expiration').type, pa.date32())
+        self.assertEqual(t.schema.field('open_interest').type, pa.int64())
+
+    def tearDown(self):
+        wallstreet._scheduler = self.oldscheduler
+        wallstreet._chains.clear()
+        wallstreet._expirations.clear()
+        blackandscholes.requests = self.oldrequests
+
+
+class ExportMissingTest(StubTestCase):
+    def test_missing_fields(self):
+        self.stub.drop = ('bid', 'volume', 'openInterest', 'contractSymbol')
+        exp = self.exps[0]
+        c = wallstreet.Call('STUB', d=exp.day, m=exp.month, y=exp.year)
+        a = c.to_numpy()
+        for name in ('bid', 'volume', 'open_interest', 'code'):
+            self.assertEqual(list(a[name].mask), [False, False, True], msg=name)
+        row = c.to_arrow().to_pylist()[-1]
+        self.assertEqual([row[k] for k in ('bid', 'volume', 'open_interest', 'code')], [None] * 4)
+        self.assertEqual(row['ask'], 6)
+
+    def test_option_export(self):
+        exp = self.exps[0]
+        o = wallstreet.Option('STUB', 'Put', d=exp.day, m=exp.month, y=exp.year)
+        t = o.to_arrow()
+        self.assertEqual(t.column('strike').to_pylist(), [90, 100, 110])
+        self.assertEqual(t.column('itm').to_pylist(), [False, False, True])
+        self.assertEqual(len(o.to_numpy()), 3)
+
+
+class ChainCacheTest(StubTestCase):
+    def option(self, cls, exp, **kwargs):
+        return cls('STUB', d=exp.day, m=exp.month, y=exp.year, **kwargs)
+
+    def test_closest_date(self):
+        c = self.option(wallstreet.Call, self.exps[0] + timedelta(days=3))
+        self.assertEqual(c.expiration, self.exps[0].strftime(wallstreet.DATE_FORMAT))
+        self.assertEqual(len(self.stub.requests), 1)  # The stock request lists the expirations and the nearest chain
+
+    def test_closest_date_keeps_type(self):
+        p = self.option(wallstreet.Put, self.exps[1] - timedelta(days=2))
+        self.assertEqual(p.expiration, self.exps[1].strftime(wallstreet.DATE_FORMAT))
+        self.assertEqual(p.strikes, (90, 100, 110))
+        self.assertEqual(len(self.stub.chain_requests()), 1)
+
+    def test_one_sided(self):
+        c = self.option(wallstreet.Call, self.exps[1])
+        self.assertEqual(c.expiration, self.exps[0].strftime(wallstreet.DATE_FORMAT))
+        self.assertNotIn(self.exps[1].strftime(wallstreet.DATE_FORMAT), c.expirations)
+        self.assertEqual(len(self.option(wallstreet.Put, self.exps[1]).expirations), 3)
+
+    def test_strict(self):
+        with self.assertRaises(ValueError):
+            self.option(wallstreet.Call, self.exps[0] + timedelta(days=3), strict=True)
+        with self.assertRaises(ValueError):
+            self.option(wallstreet.Call, self.exps[1], strict=True)
+
+    def test_lowercase(self):
+        wallstreet.Option('stub', 'Put', d=self.exps[0].day, m=self.exps[0].month, y=self.exps[0].year)
+        self.assertEqual(self.stub.chain_requests(), [])
+
+    def test_prefetch(self):
+        prefetched = wallstreet.Option.prefetch('stub')
+        self.assertEqual(prefetched, [exp.strftime(wallstreet.DATE_FORMAT) for exp in self.exps])
+        self.stub.requests.clear()
+        for exp in self.exps:
+            self.option(wallstreet.Put, exp)
+        self.assertEqual(self.stub.chain_requests(), [])
+
+    def test_prefetch_skips_cached(self):
+        wallstreet.Option.prefetch('STUB')
+        self.assertEqual(len(self.stub.requests), 3)  # The listing brings the nearest chain
+        self.stub.requests.clear()
+        wallstreet.Option.prefetch('STUB', [self.exps[1]])
+        self.assertEqual(self.stub.requests, [])
+
+    def test_prefetch_expired_listing(self):
+        oldttl = wallstreet.CHAIN_CACHE_TTL
+        wallstreet.CHAIN_CACHE_TTL = 0
+        try:
+            prefetched = wallstreet.Option.prefetch('STUB')
+        finally:
+            wallstreet.CHAIN_CACHE_TTL = oldttl
+        self.assertEqual(prefetched, [exp.strftime(wallstreet.DATE_FORMAT) for exp in self.exps])
+
+    def test_prefetch_unlisted(self):
+        prefetched = wallstreet.Option.prefetch('STUB', [self.exps[2] + timedelta(days=2), self.exps[2]])
+        self.assertEqual(prefetched, [self.exps[2].strftime(wallstreet.DATE_FORMAT)])
+        self.assertEqual(len(self.stub.chain_requests()), 1)
+
+    def test_eviction(self):
+        oldttl = wallstreet.CHAIN_CACHE_TTL
+        wallstreet.CHAIN_CACHE_TTL = 0
+        try:
+            self.option(wallstreet.Call, self.exps[0])
+            wallstreet._store_chain('OTHER', {'expirationDates': [], 'options': []})
+        finally:
+            wallstreet.CHAIN_CACHE_TTL = oldttl
+        self.assertEqual(list(wallstreet._expirations), ['OTHER'])
+        self.assertEqual(wallstreet._chains, {})
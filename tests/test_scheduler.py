@@ -0,0 +1,151 @@
+import unittest
+import threading
+from time import monotonic, sleep
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from yfinance.exceptions import YFRateLimitError
+
+from wallstreet import wallstreet
+from wallstreet.scheduler import RequestScheduler
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    hits = Counter()
+    failures = {'/throttled': 429, '/broken': 503}
+
+    def do_GET(self):
+        self.hits[self.path] += 1
+        status = self.failures.get(self.path, 200)
+        if self.path == '/throttled' and self.hits[self.path] > 2:
+            status = 200
+        sleep(0.05)
+        self.send_response(status)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, *args):
+        pass
+
+
+class FailingFetch:
+    """ Raises error on the first `failures` calls, then returns a 200 response """
+
+    def __init__(self, error, failures):
+        self.error = error
+        self.failures = failures
+        self.calls = 0
+
+    def __call__(self, url, **kwargs):
+        self.calls += 1
+        sleep(0.05)
+        if self.calls <= self.failures:
+            raise self.error
+        return Mock(status_code=200)
+
+
+class SchedulerTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        cls.url = 'http://127.0.0.1:%s' % cls.server.server_port
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    def setUp(self):
+        StubHandler.hits.clear()
+        self.scheduler = RequestScheduler(fetch=requests.get, rate=100, burst=100, backoff=0.01)
+
+    def test_coalesce(self):
+        with ThreadPoolExecutor(10) as pool:
+            responses = list(pool.map(lambda _: self.scheduler.get(self.url + '/chain'), range(10)))
+        self.assertEqual(StubHandler.hits['/chain'], 1)
+        self.assertEqual(len(set(map(id, responses))), 1)
+        self.assertEqual(self.scheduler.stats()['coalesced'], 9)
+
+    def test_no_coalesce(self):
+        with ThreadPoolExecutor(5) as pool:
+            list(pool.map(lambda _: self.scheduler.get(self.url + '/chain', coalesce=False), range(5)))
+        self.assertEqual(StubHandler.hits['/chain'], 5)
+
+    def test_rate_limit(self):
+        scheduler = RequestScheduler(fetch=requests.get, rate=20, burst=1)
+        start = monotonic()
+        with ThreadPoolExecutor(5) as pool:
+            list(pool.map(lambda i: scheduler.get(self.url + '/%s' % i), range(5)))
+        self.assertGreaterEqual(monotonic() - start, 0.2)
+        self.assertGreater(scheduler.stats()['waited'], 0)
+
+    def test_retry_throttled(self):
+        r = self.scheduler.get(self.url + '/throttled')
+        self.assertEqual(r.status_code, 200)
+        stats = self.scheduler.stats()
+        self.assertEqual(stats['throttled'], 2)
+        self.assertEqual(stats['retries'], 2)
+        self.assertEqual(stats['requests'], 3)
+
+    def test_retries_exhausted(self):
+        r = self.scheduler.get(self.url + '/broken')
+        self.assertEqual(r.status_code, 503)
+        self.assertEqual(StubHandler.hits['/broken'], self.scheduler.retries + 1)
+        self.assertEqual(self.scheduler.stats()['throttled'], 0)
+
+    def test_idle_stats(self):
+        self.scheduler.get(self.url + '/chain')
+        stats = self.scheduler.stats()
+        self.assertEqual(stats['queued'], 0)
+        self.assertEqual(stats['in_flight'], 0)
+
+    def test_retry_rate_limit_error(self):
+        fetch = FailingFetch(YFRateLimitError(), failures=2)
+        scheduler = RequestScheduler(fetch=fetch, rate=100, burst=100, backoff=0.01)
+        with ThreadPoolExecutor(5) as pool:
+            responses = list(pool.map(lambda _: scheduler.get(self.url + '/chain'), range(5)))
+        self.assertTrue(all(r.status_code == 200 for r in responses))
+        self.assertEqual(fetch.calls, 3)
+        stats = scheduler.stats()
+        self.assertEqual(stats['throttled'], 2)
+        self.assertEqual(stats['retries'], 2)
+
+    def test_rate_limit_error_exhausted(self):
+        fetch = FailingFetch(YFRateLimitError(), failures=10)
+        scheduler = RequestScheduler(fetch=fetch, rate=100, burst=100, backoff=0.01)
+        with self.assertRaises(YFRateLimitError):
+            scheduler.get(self.url + '/chain')
+        self.assertEqual(fetch.calls, scheduler.retries + 1)
+        self.assertEqual(scheduler.stats()['throttled'], scheduler.retries)
+
+    def test_retry_connection_error(self):
+        fetch = FailingFetch(requests.ConnectionError(), failures=1)
+        scheduler = RequestScheduler(fetch=fetch, rate=100, burst=100, backoff=0.01)
+        self.assertEqual(scheduler.get(self.url + '/chain').status_code, 200)
+        stats = scheduler.stats()
+        self.assertEqual((stats['throttled'], stats['retries']), (0, 1))
+
+    def test_other_errors_not_retried(self):
+        fetch = FailingFetch(ValueError(), failures=1)
+        with self.assertRaises(ValueError):
+            RequestScheduler(fetch=fetch, backoff=0.01).get(self.url + '/chain')
+        self.assertEqual(fetch.calls, 1)
+
+    def test_shared_scheduler(self):
+        fetch = FailingFetch(YFRateLimitError(), failures=1)
+        oldscheduler, oldyfdata = wallstreet._scheduler, wallstreet.get_yfdata
+        wallstreet._scheduler = None
+        wallstreet.get_yfdata = lambda: Mock(get=fetch)
+        try:
+            scheduler = wallstreet.get_scheduler()
+            scheduler.backoff = 0.01
+            self.assertEqual(scheduler.get(self.url + '/chain').status_code, 200)
+        finally:
+            wallstreet._scheduler, wallstreet.get_yfdata = oldscheduler, oldyfdata
+        self.assertEqual(fetch.calls, 2)
+        self.assertEqual(scheduler.stats()['throttled'], 1)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
@@ -1,4 +1,10 @@
+import gzip
 import unittest
+import requests
+import threading
+from unittest.mock import Mock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 from wallstreet import wallstreet
 from tests.mockrequests import mockrequests
 
@@ -26,3 +32,86 @@ class StockTest(unittest.TestCase):
 
     def tearDown(self):
         wallstreet.requests = self.oldrequests
+
+
+class SessionTest(unittest.TestCase):
+    def setUp(self):
+        self.oldsession, self.oldyfdata = wallstreet._session, wallstreet.YfData
+        wallstreet._session = None
+
+    def test_rejected_session_not_cached(self):
+        wallstreet.YfData = Mock(side_effect=ValueError('Unsupported session'))
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                wallstreet.get_session()
+        self.assertIsNone(wallstreet._session)
+
+    def tearDown(self):
+        wallstreet._session, wallstreet.YfData = self.oldsession, self.oldyfdata
+
+
+class HistoryHandler(BaseHTTPRequestHandler):
+    rows = 2500
+    body = 'Date,Open,High,Low,Close,Adj Close,Volume\n' + ''.join(
+        '2019-07-%02d,%s,%s,%s,%s,%s,%s\n' % (i % 28 + 1, i, i + 2, i - 1, i + 1, i + 1, i * 10) for i in range(rows))
+
+    def do_GET(self):
+        body = gzip.compress(self.body.encode()) if self.path.startswith('/GZ') else self.body.encode()
+        self.send_response(200)
+        if self.path.startswith('/GZ'):
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class HistoryTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), HistoryHandler)
+        cls.session = requests.Session()
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    def setUp(self):
+        self.oldget = wallstreet.get_session
+        wallstreet.get_session = lambda: self.session  # Leaves the shared session and YfData untouched
+        self.oldlink = wallstreet.YahooFinanceHistory.quote_link
+        wallstreet.YahooFinanceHistory.quote_link = 'http://127.0.0.1:%s/{quote}' % self.server.server_port
+
+    def history(self, symbol):
+        return wallstreet.YahooFinanceHistory(symbol, days_back=30)
+
+    def test_error_closes_response(self):
+        history = self.history('PLAIN')
+        response = Mock(status_code=404, **{'raise_for_status.side_effect': requests.HTTPError()})
+        history.session = Mock(**{'get.return_value': response})
+        with self.assertRaises(requests.HTTPError):
+            history.get_quote()
+        response.close.assert_called_once_with()
+
+    def test_get_quote(self):
+        for symbol in ('PLAIN', 'GZ'):
+            df = self.history(symbol).get_quote()
+            self.assertEqual(len(df), HistoryHandler.rows)
+            self.assertEqual(str(df['Date'].dtype)[:10], 'datetime64')
+            self.assertEqual(df['Volume'].iloc[-1], (HistoryHandler.rows - 1) * 10)
+
+    def test_iter_quote(self):
+        for symbol in ('PLAIN', 'GZ'):
+            chunks = list(self.history(symbol).iter_quote(chunksize=1000))
+            self.assertEqual([len(df) for df in chunks], [1000, 1000, 500])
+            self.assertEqual(chunks[1]['Open'].iloc[0], 1000)
+            self.assertEqual(str(chunks[-1]['Date'].dtype)[:10], 'datetime64')
+
+    def tearDown(self):
+        wallstreet.YahooFinanceHistory.quote_link = self.oldlink
+        wallstreet.get_session = self.oldget
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.session.close()
+        cls.server.shutdown()
+        cls.server.server_close()
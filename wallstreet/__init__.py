@@ -1,5 +1,5 @@
-from wallstreet.wallstreet import Stock, Call, Put
+from wallstreet.wallstreet import Stock, Option, Call, Put
 
-__all__ = ['Stock', 'Call', 'Put']
+__all__ = ['Stock', 'Option', 'Call', 'Put']
 
 __version__ = "0.4.0"
\ No newline at end of file
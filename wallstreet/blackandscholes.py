@@ -1,10 +1,11 @@
 import requests
+import warnings
 import xml.etree.ElementTree as ET
 
 from scipy.interpolate import interp1d
-from numpy import sqrt, log, exp
+from numpy import sqrt, log, exp, log2, ceil, asarray, full, where, isfinite, isnan, nan, errstate
 from scipy.stats import norm
-from scipy.optimize import fsolve
+from scipy.optimize import fsolve, newton
 
 from wallstreet.constants import *
 
@@ -108,3 +109,56 @@ class BlackandScholes:
         p1 = self.BS(self.S, self.K, self.T, self.impvol, self.r + h, self.q)
         p2 = self.BS(self.S, self.K, self.T, self.impvol, self.r - h, self.q)
         return (p1-p2)/(2*h*100)
+
+
+def _bisect_volatility(bs, S, K, T, price, r, q):
+    """ Vectorized bisection on volatility, prices outside the bracket have no solution and give nan """
+    lo, hi = (full(K.shape, bound) for bound in IMPLIED_VOLATILITY_BOUNDS)
+    bracketed = (price > 0) & (bs(S, K, T, lo, r, q) <= price) & (price <= bs(S, K, T, hi, r, q))
+    width = IMPLIED_VOLATILITY_BOUNDS[1] - IMPLIED_VOLATILITY_BOUNDS[0]
+    for _ in range(int(ceil(log2(width/IMPLIED_VOLATILITY_TOLERANCE)))):
+        mid = (lo + hi)/2
+        above = bs(S, K, T, mid, r, q) > price  # Option prices increase with volatility
+        hi = where(above, mid, hi)
+        lo = where(above, lo, mid)
+    return where(bracketed, (lo + hi)/2, nan)
+
+
+def chain_greeks(S, K, T, price, r, option, q=0):
+    """ Vectorized BlackandScholes over arrays of strikes and option prices, returns a dict of arrays """
+
+    K = asarray(K, dtype=float)
+    price = asarray(price, dtype=float)
+    if K.size == 0:
+        return {key: K.copy() for key in ('impvol', 'delta', 'gamma', 'vega', 'theta', 'rho')}
+    bs = BlackandScholes._BlackScholesCall if option == 'Call' else BlackandScholes._BlackScholesPut
+
+    def fprime(sigma):
+        d1 = (log(S/K) + (r - q + (sigma**2)/2)*T)/(sigma*sqrt(T))
+        return S*exp(-q*T)*sqrt(T)*norm.pdf(d1)
+
+    with errstate(all='ignore'), warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # Strikes that do not converge are reported as nan
+        try:
+            res = newton(lambda x: bs(S, K, T, x, r, q) - price, full(K.shape, SOLVER_STARTING_VALUE),
+                         fprime=fprime, tol=IMPLIED_VOLATILITY_TOLERANCE, full_output=True, disp=False)
+            iv = where(res.converged & isfinite(res.root) & (res.root > 0), res.root, nan)
+        except RuntimeError:  # Array newton raises regardless of disp when no strike converges
+            iv = full(K.shape, nan)
+
+        failed = isnan(iv)
+        if failed.any():  # Wings and short expiries overshoot, bisection always converges when bracketed
+            iv[failed] = _bisect_volatility(bs, S, K[failed], T, price[failed], r, q)
+
+        h = DELTA_DIFFERENTIAL
+        delta = (bs(S + h, K, T, iv, r, q) - bs(S - h, K, T, iv, r, q))/(2*h)
+        h = GAMMA_DIFFERENTIAL
+        gamma = (bs(S + h, K, T, iv, r, q) - 2*bs(S, K, T, iv, r, q) + bs(S - h, K, T, iv, r, q))/(h**2)
+        h = VEGA_DIFFERENTIAL
+        vega = (bs(S, K, T, iv + h, r, q) - bs(S, K, T, iv - h, r, q))/(2*h*100)
+        h = THETA_DIFFERENTIAL
+        theta = (bs(S, K, T + h, iv, r, q) - bs(S, K, T - h, iv, r, q))/(2*h*365)
+        h = RHO_DIFFERENTIAL
+        rho = (bs(S, K, T, iv, r + h, q) - bs(S, K, T, iv, r - h, q))/(2*h*100)
+
+    return {'impvol': iv, 'delta': delta, 'gamma': gamma, 'vega': vega, 'theta': theta, 'rho': rho}
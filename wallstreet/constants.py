@@ -10,7 +10,16 @@ RHO_DIFFERENTIAL = 1.e-4
 THETA_DIFFERENTIAL = 1.e-5
 
 IMPLIED_VOLATILITY_TOLERANCE = 1.e-6
+IMPLIED_VOLATILITY_BOUNDS = (1.e-4, 5.)  # bracket for strikes the Newton solve gives up on
 SOLVER_STARTING_VALUE = 0.27
 
 OVERNIGHT_RATE = 0
 FALLBACK_RISK_FREE_RATE = 0.02
+
+CHAIN_CACHE_TTL = 60  # seconds a fetched option chain is reused for
+
+RATE_LIMIT = 5  # requests per second per host
+RATE_BURST = 10
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5  # seconds, doubled on every retry
+RETRY_STATUSES = (429, 500, 502, 503, 504)
@@ -0,0 +1,137 @@
+import random
+from threading import Lock
+from time import monotonic, sleep
+from urllib.parse import urlsplit
+from concurrent.futures import Future
+
+import requests
+
+from wallstreet.constants import RATE_LIMIT, RATE_BURST, MAX_RETRIES, BACKOFF_BASE, RETRY_STATUSES
+
+try:
+    from yfinance.exceptions import YFRateLimitError
+    THROTTLE_ERRORS = (YFRateLimitError,)  # YfData.get raises this on HTTP 429 instead of returning the response
+except ImportError:
+    THROTTLE_ERRORS = ()
+TRANSIENT_ERRORS = (requests.ConnectionError, requests.Timeout)
+
+
+class TokenBucket:
+    """ Allows `rate` acquisitions per second on average and bursts of up to `capacity` """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last = monotonic()
+        self._lock = Lock()
+
+    def acquire(self):
+        """ Takes a token, sleeping until it is available, and returns the time waited """
+        with self._lock:
+            now = monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1  # Reserve the token now so that waiting callers are served in order
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait:
+            sleep(wait)
+        return wait
+
+
+class RequestScheduler:
+    """ Rate limits requests per host, shares one fetch between identical concurrent
+    requests and retries throttled or failed ones with jittered exponential backoff """
+
+    def __init__(self, fetch, rate=RATE_LIMIT, burst=RATE_BURST, retries=MAX_RETRIES, backoff=BACKOFF_BASE):
+        self.fetch = fetch
+        self.rate = rate
+        self.burst = burst
+        self.retries = retries
+        self.backoff = backoff
+        self._lock = Lock()
+        self._buckets = {}
+        self._in_flight = {}
+        self._stats = {'queued': 0, 'in_flight': 0, 'requests': 0, 'coalesced': 0,
+                       'throttled': 0, 'retries': 0, 'waited': 0.0}
+
+    def stats(self):
+        """ Returns a snapshot of the queue depth and throttling counters """
+        with self._lock:
+            return dict(self._stats)
+
+    def _count(self, key, val=1):
+        with self._lock:
+            self._stats[key] += val
+
+    def _bucket(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.rate, self.burst)
+            return self._buckets[host]
+
+    def get(self, url, fetch=None, coalesce=True, **kwargs):
+        """ Fetches url with fetch(url, **kwargs), callers asking for the same request
+        while it is in flight all receive the same response object """
+
+        fetch = fetch or self.fetch
+        if not coalesce:
+            return self._get(fetch, url, kwargs)
+
+        key = (fetch, url, repr(sorted(kwargs.items())))
+        with self._lock:
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self._in_flight[key] = Future()
+            else:
+                self._stats['coalesced'] += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            future.set_result(self._get(fetch, url, kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+        return future.result()
+
+    def _get(self, fetch, url, kwargs):
+        bucket = self._bucket(url)
+        attempt = 0
+        while True:
+            self._count('queued')
+            try:
+                self._count('waited', bucket.acquire())
+            finally:
+                self._count('queued', -1)
+
+            self._count('in_flight')
+            self._count('requests')
+            error = None
+            try:
+                response = fetch(url, **kwargs)
+            except THROTTLE_ERRORS + TRANSIENT_ERRORS as e:
+                error = e
+            finally:
+                self._count('in_flight', -1)
+
+            if error is not None:
+                if attempt >= self.retries:
+                    raise error
+                throttled = isinstance(error, THROTTLE_ERRORS)
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt >= self.retries:
+                    return response
+                throttled = response.status_code == 429
+                response.close()
+
+            if throttled:
+                self._count('throttled')
+            self._count('retries')
+            sleep(random.uniform(0, self.backoff * 2 ** attempt))  # Full jitter keeps retrying clients apart
+            attempt += 1
@@ -2,14 +2,31 @@ import requests
 from yfinance.data import YfData
 
 from datetime import datetime, date, timedelta
-from time import mktime
-from io import StringIO
+from time import mktime, monotonic
 
-from wallstreet.constants import DATE_FORMAT, DATETIME_FORMAT
-from wallstreet.blackandscholes import riskfree, BlackandScholes
+from wallstreet.constants import DATE_FORMAT, DATETIME_FORMAT, CHAIN_CACHE_TTL
+from wallstreet.blackandscholes import riskfree, BlackandScholes, chain_greeks
+from wallstreet.scheduler import RequestScheduler
 
 from functools import wraps
-from collections import defaultdict
+from contextlib import closing
+from collections import namedtuple
+from threading import Lock
+from concurrent.futures import ThreadPoolExecutor
+
+_session_lock = Lock()
+_session = None
+_scheduler = None
+_rate_lock = Lock()
+_chain_lock = Lock()
+_chains = {}  # (symbol, expiration) -> (fetched at, chain)
+_expirations = {}  # symbol -> (fetched at, listed expirations)
+
+StockQuote = namedtuple('StockQuote', ['ticker', 'price', 'currency', 'exchange', 'change', 'cp',
+                                       'last_trade', 'name', 'dy'])
+OptionQuote = namedtuple('OptionQuote', ['strike', 'price', 'bid', 'ask', 'change', 'cp', 'volume',
+                                         'open_interest', 'code', 'id', 'exchange', 'itm', 'BandS'])
+OptionState = namedtuple('OptionState', ['data', 'strikes', 'T', 'q', 'quote'])
 
 def parse(val):
     if val == '-':
@@ -35,6 +52,54 @@ def get_headers(agent='Mozilla/5.0'):
     
     return headers
 
+
+def get_session():
+    """ Returns the process-wide session, creating it on first use """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            # YfData is a singleton, passing a session replaces the one every other thread is using
+            YfData(session=session)
+            _session = session  # Only publish it once YfData has accepted it
+        return _session
+
+
+def get_yfdata():
+    get_session()
+    return YfData()
+
+
+def get_scheduler():
+    """ Returns the process-wide scheduler every Yahoo request goes through """
+    global _scheduler
+    with _session_lock:
+        if _scheduler is None:
+            _scheduler = RequestScheduler(fetch=lambda url, **kwargs: get_yfdata().get(url, **kwargs))
+        return _scheduler
+
+
+def _store_chain(symbol, result):
+    """ Caches the expirations and chains contained in an optionChain result and evicts expired entries """
+    now = monotonic()
+    exp = [datetime.utcfromtimestamp(i).date() for i in result['expirationDates']]
+    with _chain_lock:
+        for cache in (_chains, _expirations):
+            for key in [key for key, (fetched, _) in cache.items() if now - fetched >= CHAIN_CACHE_TTL]:
+                del cache[key]
+        _expirations[symbol] = (now, exp)
+        for chain in result.get('options', []):
+            if 'expirationDate' in chain:
+                _chains[symbol, datetime.utcfromtimestamp(chain['expirationDate']).date()] = (now, chain)
+
+
+def _cached(cache, key):
+    with _chain_lock:
+        hit = cache.get(key)
+    if hit and monotonic() - hit[0] < CHAIN_CACHE_TTL:
+        return hit[1]
+    return None
+
 class ClassPropertyDescriptor:
     def __init__(self, f):
         self.f = f
@@ -69,15 +134,20 @@ class YahooFinanceHistory:
 
     def __init__(self, symbol, days_back=7, frequency='d'):
         self.symbol = symbol
-        self.session = requests.Session()
+        self.session = get_session()
         self.dt = timedelta(days=days_back)
         self.frequency = {'m': 'mo', 'w': 'wk', 'd': 'd'}[frequency]
 
-    def get_quote(self):
+    @staticmethod
+    def _pandas():
         try:
             import pandas as pd
         except ImportError:
             raise ImportError('This functionality requires pandas to be installed')
+        return pd
+
+    def _download(self):
+        """ Opens the CSV download without reading the body """
 
         now = datetime.utcnow()
         dateto = int(now.timestamp())
@@ -85,9 +155,29 @@ class YahooFinanceHistory:
         url = self.quote_link.format(quote=self.symbol)
         params = {'period1': datefrom, 'period2': dateto, 'interval': f'1{self.frequency}', 'events': 'history', 'includeAdjustedClose': True}
         headers = get_headers()
-        response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
-        response.raise_for_status()
-        return pd.read_csv(StringIO(response.text), parse_dates=['Date'])
+        response = get_scheduler().get(url, fetch=self.session.get, coalesce=False, params=params,
+                                       headers=headers, timeout=self.timeout, stream=True)
+        try:
+            response.raise_for_status()
+        except requests.HTTPError:
+            response.close()  # Release the pooled connection, the body is never read
+            raise
+        response.raw.decode_content = True  # Let urllib3 undo any gzip encoding while pandas reads
+        return response
+
+    def get_quote(self):
+        pd = self._pandas()
+
+        with closing(self._download()) as response:
+            return pd.read_csv(response.raw, parse_dates=['Date'])
+
+    def iter_quote(self, chunksize=10000):
+        """ Yields DataFrames of at most chunksize bars, parsed straight from the socket as they arrive """
+        pd = self._pandas()
+
+        with closing(self._download()) as response:
+            with pd.read_csv(response.raw, parse_dates=['Date'], chunksize=chunksize) as reader:
+                yield from reader
 
 
 class Stock:
@@ -97,11 +187,9 @@ class Stock:
         quote = quote.upper()
         self._attempted_ticker = quote
         self._attempted_exchange = exchange
-        self.session = requests.Session()
-        self._yfdata = YfData(session=self.session)
 
         self.source = source.lower()
-        self._yahoo(quote, exchange)
+        self._quote = self._yahoo(quote, exchange)
 
     def _yahoo(self, quote, exchange=None):
         """ Collects data from Yahoo Finance API """
@@ -109,118 +197,288 @@ class Stock:
         query = quote + "." + exchange.upper() if exchange else quote
 
         url = __class__._Y_API + query
-        r = self._yfdata.get(url)
+        r = get_scheduler().get(url)
 
         if r.status_code == 404:
             raise LookupError('Ticker symbol not found.')
         else:
             r.raise_for_status()
 
-        jayson = r.json()['optionChain']['result'][0]['quote']
-
-        self.ticker = jayson['symbol']
-        self._price = jayson['regularMarketPrice']
-        self.currency = jayson['currency']
-        self.exchange = jayson['exchange']
-        self.change = jayson['regularMarketChange']
-        self.cp = jayson['regularMarketChangePercent']
-        self._last_trade = datetime.utcfromtimestamp(jayson['regularMarketTime'])
-        self.name = jayson.get('longName', '')
-        self.dy = jayson.get('trailingAnnualDividendYield', 0)
+        result = r.json()['optionChain']['result'][0]
+        _store_chain(query, result)  # The response already lists the expirations and the nearest chain
+        jayson = result['quote']
+
+        return StockQuote(
+            ticker=jayson['symbol'],
+            price=jayson['regularMarketPrice'],
+            currency=jayson['currency'],
+            exchange=jayson['exchange'],
+            change=jayson['regularMarketChange'],
+            cp=jayson['regularMarketChangePercent'],
+            last_trade=datetime.utcfromtimestamp(jayson['regularMarketTime']),
+            name=jayson.get('longName', ''),
+            dy=jayson.get('trailingAnnualDividendYield', 0)
+        )
 
     def update(self):
-        self.__init__(self._attempted_ticker, exchange=self._attempted_exchange, source=self.source)
+        """ Fetches a fresh quote and swaps it in with a single assignment """
+        self._quote = self._yahoo(self._attempted_ticker, self._attempted_exchange)
 
     def __repr__(self):
         return 'Stock(ticker=%s, price=%s)' % (self.ticker, self.price)
 
+    @property
+    def ticker(self):
+        return self._quote.ticker
+
+    @property
+    def currency(self):
+        return self._quote.currency
+
+    @property
+    def exchange(self):
+        return self._quote.exchange
+
+    @property
+    def change(self):
+        return self._quote.change
+
+    @property
+    def cp(self):
+        return self._quote.cp
+
+    @property
+    def name(self):
+        return self._quote.name
+
+    @property
+    def dy(self):
+        return self._quote.dy
+
     @property
     def price(self):
         self.update()
-        return self._price
+        return self._quote.price
 
     @property
     def last_trade(self):
-        if not self._last_trade:
+        if not self._quote.last_trade:
             return None
         self.update()
-        return self._last_trade.strftime(DATETIME_FORMAT)
+        return self._quote.last_trade.strftime(DATETIME_FORMAT)
 
-    def historical(self, days_back=30, frequency='d'):
-        return YahooFinanceHistory(symbol=self.ticker, days_back=days_back, frequency=frequency).get_quote()
+    def historical(self, days_back=30, frequency='d', chunksize=None):
+        history = YahooFinanceHistory(symbol=self.ticker, days_back=days_back, frequency=frequency)
+        if chunksize:
+            return history.iter_quote(chunksize=chunksize)
+        return history.get_quote()
 
 
 class Option:
     _Y_API = 'https://query2.finance.yahoo.com/v7/finance/options/'
-
-    def __new__(cls, *args, **kwargs):
-        instance = super().__new__(cls)
-        instance._has_run = False  # This is to prevent an infinite loop
-        instance._skip_dates = defaultdict(set)  #  In case a date is listed as an expiration date but has only one type of options
-        return instance
+    _CHAINS = {'Call': 'calls', 'Put': 'puts'}
 
     def __init__(self, quote, opt_type, d=date.today().day, m=date.today().month,
                  y=date.today().year, strict=False, source='yahoo'):
 
+        quote = quote.upper()
         self.source = source.lower()
         self.underlying = Stock(quote, source=self.source)
+        self.expiration = date(y, m, d)
+        self._opt_type = opt_type
+        self._state_lock = Lock()
+        self._update_lock = Lock()
 
-        self._yahoo(quote, d, m, y)
+        listed = _cached(_expirations, quote)
+        if listed is None:
+            _, listed = self._yahoo(quote, self._expiration)
+        self._exp = list(listed)
+
+        while True:
+            self._expiration = self._listed(self._expiration, self._exp, strict)
+
+            chain = _cached(_chains, (quote, self._expiration)) or self._yahoo(quote, self._expiration)[0]
+            data = chain.get(__class__._CHAINS[opt_type])
+            if data:
+                break
+            self._exp.remove(self._expiration)  # Date is in expirations list but has only one type of options
 
-        self._exp = [exp for exp in self._exp if exp not in self._skip_dates[opt_type]]
         self.expirations = [exp.strftime(DATE_FORMAT) for exp in self._exp]
-        self.expiration = date(y, m, d)
+        self._state = OptionState(data=data, strikes=self._strikes(data),
+                                  T=(self._expiration - date.today()).days/365, q=self.underlying.dy, quote=None)
+
+    @staticmethod
+    def _listed(expiration, listed, strict=False):
+        """ Returns expiration if it is listed, else the closest listed date unless strict """
+        if expiration in listed:
+            return expiration
+        if strict or not listed:
+            raise ValueError('Possible expiration dates for this option are:',
+                             [exp.strftime(DATE_FORMAT) for exp in listed])
+        closest_date = min(listed, key=lambda x: abs(x - expiration))
+        print('No options listed for given date, using %s instead' % closest_date.strftime(DATE_FORMAT))
+        return closest_date
+
+    @staticmethod
+    def _strikes(data):
+        return tuple(parse(dic['strike']) for dic in data if dic.get('p') != '-')
+
+    def _swap(self, build):
+        """ Swaps in build(current state), rebuilding if another thread swapped first so no change is lost """
+        while True:
+            state = self._state
+            new = build(state)
+            with self._state_lock:
+                if self._state is state:
+                    self._state = new
+                    return new
 
-        try:
-            if opt_type == 'Call':
-                self.data = self.data['calls']
-            elif opt_type == 'Put':
-                self.data = self.data['puts']
-            assert self.data
-
-        except (KeyError, AssertionError):
-            if self._expiration in self._exp:  # Date is in expirations list but no data for it
-                self._skip_dates[opt_type].add(self._expiration)
-                self._exp.remove(self._expiration)
-                self._has_run = False
-
-            if all((d, m, y)) and not self._has_run and not strict:
-                closest_date = min(self._exp, key=lambda x: abs(x - self._expiration))
-                print('No options listed for given date, using %s instead' % closest_date.strftime(DATE_FORMAT))
-                self._has_run = True
-                self.__init__(quote, closest_date.day, closest_date.month, closest_date.year, source=source)
-            else:
-                raise ValueError('Possible expiration dates for this option are:', self.expirations) from None
+    @property
+    def data(self):
+        return self._state.data
 
-    def _yahoo(self, quote, d, m, y):
-        """ Collects data from Yahoo Finance API """
+    @property
+    def strikes(self):
+        return self._state.strikes
+
+    @property
+    def T(self):
+        return self._state.T
+
+    @T.setter
+    def T(self, val):
+        self._swap(lambda state: state._replace(T=val))
 
-        epoch = int(round(mktime(date(y, m, d).timetuple())/86400, 0)*86400)
+    @property
+    def q(self):
+        return self._state.q
+
+    @q.setter
+    def q(self, val):
+        self._swap(lambda state: state._replace(q=val))
+
+    @staticmethod
+    def _yahoo(quote, expiration=None):
+        """ Collects data from Yahoo Finance API, the nearest chain if no expiration is given """
+
+        url = __class__._Y_API + quote
+        if expiration:
+            url += '?date=' + str(int(round(mktime(expiration.timetuple())/86400, 0)*86400))
+
+        r = get_scheduler().get(url)
 
-        self._yfdata = self.underlying._yfdata
-        
-        r = self._yfdata.get(__class__._Y_API + quote + '?date=' + str(epoch))
-        
         if r.status_code == 404:
             raise LookupError('Ticker symbol not found.')
         else:
             r.raise_for_status()
 
-        json = r.json()
+        result = r.json()['optionChain']['result'][0]
+        _store_chain(quote, result)
 
         try:
-            self.data = json['optionChain']['result'][0]['options'][0]
+            data = result['options'][0]
         except IndexError:
             raise LookupError('No options listed for this stock.')
 
-        self._exp = [datetime.utcfromtimestamp(i).date() for i in json['optionChain']['result'][0]['expirationDates']]
+        exp = [datetime.utcfromtimestamp(i).date() for i in result['expirationDates']]
+        return data, exp
+
+    @staticmethod
+    def prefetch(quote, expirations=None, max_workers=None):
+        """ Fetches the chains for all or the given expirations in parallel, so that options
+        created for them within CHAIN_CACHE_TTL need no request for the chain """
+
+        quote = quote.upper()
+        listed = _cached(_expirations, quote)
+        if listed is None:
+            _, listed = __class__._yahoo(quote)  # Caches the nearest chain as well
+
+        if expirations is None:
+            expirations = listed
+        else:
+            expirations = [datetime.strptime(exp, DATE_FORMAT).date() if isinstance(exp, str) else exp
+                           for exp in expirations]
+            # Yahoo answers an unlisted date with another expiration's chain, so fetch the closest listed one
+            expirations = list(dict.fromkeys(__class__._listed(exp, listed) for exp in expirations))
+
+        missing = [exp for exp in expirations if _cached(_chains, (quote, exp)) is None]
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            list(pool.map(lambda exp: __class__._yahoo(quote, exp), missing))
+        return [exp.strftime(DATE_FORMAT) for exp in expirations]
+
+    def _columns(self):
+        """ Quotes, implied volatility and greeks for every listed strike as numpy masked arrays,
+        fields missing from the chain are masked """
+        import numpy as np
+
+        state = self._state
+        rows = [dic for dic in state.data if dic.get('p') != '-']
+
+        def column(key, dtype, fill=0):
+            values = np.array([dic.get(key) for dic in rows], dtype=object)
+            mask = np.equal(values, None)
+            values[mask] = fill
+            return np.ma.masked_array(values.astype(dtype), mask=mask)
+
+        cols = {
+            'code': column('contractSymbol', str, fill=''),
+            'expiration': np.ma.masked_array(np.full(len(rows), np.datetime64(self._expiration, 'D'))),
+            'strike': column('strike', float),
+            'price': column('lastPrice', float, fill=np.nan),
+            'bid': column('bid', float),
+            'ask': column('ask', float),
+            'change': column('change', float),
+            'cp': column('percentChange', float),
+            'volume': column('volume', np.int64),
+            'open_interest': column('openInterest', np.int64),
+        }
+
+        spot = self.underlying.price
+        if self._opt_type == 'Call':
+            cols['itm'] = np.ma.masked_array(spot > cols['strike'].data)
+        else:
+            cols['itm'] = np.ma.masked_array(spot < cols['strike'].data)
+        greeks = chain_greeks(spot, cols['strike'].data, state.T, cols['price'].data, self.rate(state.T),
+                              self._opt_type, state.q)
+        cols.update((key, np.ma.masked_array(val)) for key, val in greeks.items())  # Unsolved strikes are nan
+        return cols
+
+    def to_numpy(self):
+        """ Returns the whole chain for this expiration as a numpy masked record array """
+        from numpy.ma import mrecords
+
+        cols = self._columns()
+        return mrecords.fromarrays(list(cols.values()), names=list(cols))
+
+    def to_arrow(self):
+        """ Returns the whole chain for this expiration as a pyarrow Table, missing fields are null """
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError('This functionality requires pyarrow to be installed')
+
+        import numpy as np
+
+        cols = self._columns()
+        return pa.table({key: pa.array(col.data, mask=np.ma.getmaskarray(col)) for key, col in cols.items()})
+
+    def to_parquet(self, path, **kwargs):
+        """ Writes the whole chain for this expiration to a parquet file """
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError('This functionality requires pyarrow to be installed')
+
+        pq.write_table(self.to_arrow(), path, **kwargs)
 
     @classproperty
     def rate(cls):
-        if not hasattr(cls, '_rate'):
-            cls._rate = riskfree()
+        if not hasattr(__class__, '_rate'):
+            with _rate_lock:
+                if not hasattr(__class__, '_rate'):  # Another thread may have fetched it while we waited
+                    __class__._rate = riskfree()
 
-        return cls._rate
+        return __class__._rate
 
     @property
     def expiration(self):
@@ -241,12 +499,7 @@ class Call(Option):
         kw = {'d': d, 'm': m, 'y': y, 'strict': strict, 'source': source}
         super().__init__(quote, self.__class__.Option_type, **kw)
 
-        self.T = (self._expiration - date.today()).days/365
-        self.q = self.underlying.dy
         self.ticker = quote
-        self.strike = None
-        self.strikes = tuple(parse(dic['strike']) for dic in self.data
-                             if dic.get('p') != '-')
         if strike:
             if strike in self.strikes:
                 self.set_strike(strike)
@@ -254,45 +507,67 @@ class Call(Option):
                 if strict:
                     raise LookupError('No options listed for given strike price.')
                 else:
-                    closest_strike = min(self.strikes, key=lambda x: abs(x - strike))
+                    closest_strike = self._closest_strike(self.strikes, strike)
                     print('No option for given strike, using %s instead' % closest_strike)
                     self.set_strike(closest_strike)
 
-    def set_strike(self, val):
-        """ Specifies a strike price """
+    @staticmethod
+    def _contract(d):
+        """ Normalizes one contract of the raw chain """
+        return {
+            'strike': parse(d['strike']),
+            'price': parse(d.get('p')) or d.get('lastPrice'),
+            'bid': parse(d.get('b')) or d.get('bid', 0),
+            'ask': parse(d.get('a')) or d.get('ask', 0),
+            'change': parse(d.get('c')) or d.get('change', 0),  # change in currency
+            'cp': parse(d.get('cp', 0)) or d.get('percentChange', 0),  # percentage change
+            'volume': parse(d.get('vol')) or d.get('volume', 0),
+            'open_interest': parse(d.get('oi')) or d.get('openInterest', 0),
+            'code': d.get('s') or d.get('contractSymbol'),
+            'id': d.get('cid'),
+            'exchange': d.get('e'),
+        }
+
+    @staticmethod
+    def _closest_strike(strikes, val):
+        if not strikes:
+            raise LookupError('No options listed for given strike price.')
+        return min(strikes, key=lambda x: abs(x - val))
+
+    def _snapshot(self, state, val, spot):
+        """ Returns state with the quote for the given strike priced off spot, raises LookupError if it is not listed """
 
         d = {}
-        for dic in self.data:
-            if parse(dic['strike']) == val and val in self.strikes:
+        for dic in state.data:
+            if parse(dic['strike']) == val and val in state.strikes:
                 d = dic
                 break
-        if d:
-            self._price = parse(d.get('p')) or d.get('lastPrice')
-            self.id = d.get('cid')
-            self.exchange = d.get('e')
-            self._bid = parse(d.get('b')) or d.get('bid', 0)
-            self._ask = parse(d.get('a')) or d.get('ask', 0)
-            self.strike = parse(d['strike'])
-            self._change = parse(d.get('c')) or d.get('change', 0) # change in currency
-            self._cp = parse(d.get('cp', 0)) or d.get('percentChange', 0) # percentage change
-            self._volume = parse(d.get('vol')) or d.get('volume', 0)
-            self._open_interest = parse(d.get('oi')) or d.get('openInterest', 0)
-            self.code = d.get('s') or d.get('contractSymbol')
-            self.itm = ((self.__class__.Option_type == 'Call' and self.underlying.price > self.strike) or
-                (self.__class__.Option_type == 'Put' and self.underlying.price < self.strike)) # in the money
-            self.BandS = BlackandScholes(
-                    self.underlying.price,
-                    self.strike,
-                    self.T,
-                    self._price,
-                    self.rate(self.T),
-                    self.__class__.Option_type,
-                    self.q
-                    )
-
-        else:
+        if not d:
             raise LookupError('No options listed for given strike price.')
 
+        c = self._contract(d)
+        quote = OptionQuote(
+            itm=((self.__class__.Option_type == 'Call' and spot > c['strike']) or
+                 (self.__class__.Option_type == 'Put' and spot < c['strike'])),  # in the money
+            BandS=BlackandScholes(
+                spot,
+                c['strike'],
+                state.T,
+                c['price'],
+                self.rate(state.T),
+                self.__class__.Option_type,
+                state.q
+            ),
+            **c
+        )
+        return state._replace(quote=quote)
+
+    def set_strike(self, val):
+        """ Specifies a strike price """
+
+        spot = self.underlying.price
+        self._swap(lambda state: self._snapshot(state, val, spot))
+
     def __repr__(self):
         if self.strike:
             return self.__class__.Option_type + "(ticker=%s, expiration=%s, strike=%s)" % (self.ticker, self.expiration, self.strike)
@@ -300,68 +575,123 @@ class Call(Option):
             return self.__class__.Option_type + "(ticker=%s, expiration=%s)" % (self.ticker, self.expiration)
 
     def update(self):
-        self.__init__(self.ticker, self._expiration.day,
-                     self._expiration.month, self._expiration.year,
-                     self.strike, source=self.source)
+        """ Re-fetches the chain and swaps in a new state, readers never see a half-built option.
+        Threads that call it while a refresh is running wait for that refresh instead of starting another """
+
+        if not self._update_lock.acquire(blocking=False):
+            with self._update_lock:
+                return
+
+        try:
+            exp = self._expiration
+            data, _ = self._yahoo(self.ticker, exp)
+            data = data.get(Option._CHAINS[self.__class__.Option_type])
+            if not data:
+                raise LookupError('No options listed for given date.')
+            fresh = OptionState(data=data, strikes=self._strikes(data), T=(exp - date.today()).days/365,
+                                q=self.underlying.dy, quote=None)
+            spot = self.underlying.price
+
+            def build(state):
+                if state.quote is None:
+                    return fresh
+                strike = state.quote.strike  # Keep the strike of the state being replaced
+                if strike not in fresh.strikes:
+                    strike = self._closest_strike(fresh.strikes, strike)
+                    print('No option for given strike, using %s instead' % strike)
+                return self._snapshot(fresh, strike, spot)
+
+            self._swap(build)
+        finally:
+            self._update_lock.release()
+
+    @property
+    def _quote(self):
+        return self._state.quote
+
+    @property
+    def strike(self):
+        quote = self._state.quote
+        return quote.strike if quote else None
+
+    @property
+    def id(self):
+        return self._quote.id
+
+    @property
+    def code(self):
+        return self._quote.code
+
+    @property
+    def exchange(self):
+        return self._quote.exchange
+
+    @property
+    def itm(self):
+        return self._quote.itm
+
+    @property
+    def BandS(self):
+        return self._quote.BandS
 
     @property
     @strike_required
     def bid(self):
-        return self._bid
+        return self._quote.bid
 
     @property
     @strike_required
     def ask(self):
-        return self._ask
+        return self._quote.ask
 
     @property
     @strike_required
     def price(self):
-        return self._price
+        return self._quote.price
 
     @property
     @strike_required
     def change(self):
-        return self._change
+        return self._quote.change
 
     @property
     @strike_required
     def cp(self):
-        return self._cp
+        return self._quote.cp
 
     @property
     @strike_required
     def open_interest(self):
-        return self._open_interest
+        return self._quote.open_interest
 
     @property
     @strike_required
     def volume(self):
-        return self._volume
+        return self._quote.volume
 
     @strike_required
     def implied_volatility(self):
-        return self.BandS.impvol
+        return self._quote.BandS.impvol
 
     @strike_required
     def delta(self):
-        return self.BandS.delta()
+        return self._quote.BandS.delta()
 
     @strike_required
     def gamma(self):
-        return self.BandS.gamma()
+        return self._quote.BandS.gamma()
 
     @strike_required
     def vega(self):
-        return self.BandS.vega()
+        return self._quote.BandS.vega()
 
     @strike_required
     def rho(self):
-        return self.BandS.rho()
+        return self._quote.BandS.rho()
 
     @strike_required
     def theta(self):
-        return self.BandS.theta()
+        return self._quote.BandS.theta()
 
 
 class Put(Call):